@@ -7,13 +7,14 @@ if excel_files:
     excel_file = sorted(excel_files)[-1]
     print(f"Using Excel file: {excel_file}")
     
-    # Read all sheet names
-    xl = pd.ExcelFile(excel_file)
+    # Open the workbook once and parse every sheet from the same handle
+    # instead of re-reading the file for each sheet
+    xl = pd.ExcelFile(excel_file, engine='calamine')
     print(f"Available sheets: {xl.sheet_names}")
     
     # If S005 sheet exists, show its content
     if 'S005_Account_Type_Category_Validation' in xl.sheet_names:
-        df = pd.read_excel(excel_file, sheet_name='S005_Account_Type_Category_Validation')
+        df = xl.parse('S005_Account_Type_Category_Validation')
         print("S005 content:")
         print(df.to_string())
     else:
@@ -21,7 +22,7 @@ if excel_files:
         # Show content of each sheet to debug
         for sheet in xl.sheet_names:
             print(f"\n--- Sheet: {sheet} ---")
-            df = pd.read_excel(excel_file, sheet_name=sheet)
+            df = xl.parse(sheet)
             print(df.to_string())
 else:
     print("No Multi_Validation_Scenarios Excel files found!")
@@ -1,3 +1,4 @@
+from google.api_core.exceptions import NotFound
 from google.cloud import bigquery
 import os
 
@@ -9,22 +10,23 @@ try:
     
     client = bigquery.Client()
     
+    # Read both table structures from table metadata - get_table is a plain
+    # metadata lookup, so no query job runs and no bytes are billed
+    table_columns = {}
+    for table_name in ('account_profiles', 'account_type_summary'):
+        try:
+            schema = client.get_table(f"cohesive-apogee-411113.banking_sample_data.{table_name}").schema
+        except NotFound:
+            schema = []
+        table_columns[table_name] = [(field.name, field.field_type) for field in schema]
+    
     # Check account_profiles table structure
     print("=== Checking account_profiles table structure ===")
-    query = """
-    SELECT column_name, data_type 
-    FROM `cohesive-apogee-411113.banking_sample_data.INFORMATION_SCHEMA.COLUMNS` 
-    WHERE table_name = 'account_profiles'
-    ORDER BY ordinal_position
-    """
-    
-    results = client.query(query).result()
-    
     print("Columns in account_profiles:")
     columns = []
-    for row in results:
-        columns.append(row.column_name)
-        print(f"  - {row.column_name} ({row.data_type})")
+    for column_name, data_type in table_columns['account_profiles']:
+        columns.append(column_name)
+        print(f"  - {column_name} ({data_type})")
     
     print(f"\nTotal columns: {len(columns)}")
     
@@ -42,36 +44,26 @@ try:
     
     # Also check account_type_summary table
     print("\n=== Checking account_type_summary table structure ===")
-    query2 = """
-    SELECT column_name, data_type 
-    FROM `cohesive-apogee-411113.banking_sample_data.INFORMATION_SCHEMA.COLUMNS` 
-    WHERE table_name = 'account_type_summary'
-    ORDER BY ordinal_position
-    """
-    
-    results2 = client.query(query2).result()
-    
     print("Columns in account_type_summary:")
     target_columns = []
-    for row in results2:
-        target_columns.append(row.column_name)
-        print(f"  - {row.column_name} ({row.data_type})")
+    for column_name, data_type in table_columns['account_type_summary']:
+        target_columns.append(column_name)
+        print(f"  - {column_name} ({data_type})")
     
     print(f"\nTotal columns: {len(target_columns)}")
     
-    # Sample data from both tables
-    print("\n=== Sample data from account_profiles (first 3 rows) ===")
-    sample_query = "SELECT * FROM `cohesive-apogee-411113.banking_sample_data.account_profiles` LIMIT 3"
-    sample_results = client.query(sample_query).result()
+    # Sample data from both tables. The two tables have different schemas, so
+    # they cannot share one result set - submit both jobs before waiting on
+    # either so they run side by side
+    sample_job = client.query("SELECT * FROM `cohesive-apogee-411113.banking_sample_data.account_profiles` LIMIT 3")
+    sample_job2 = client.query("SELECT * FROM `cohesive-apogee-411113.banking_sample_data.account_type_summary` LIMIT 3")
     
-    for i, row in enumerate(sample_results):
+    print("\n=== Sample data from account_profiles (first 3 rows) ===")
+    for i, row in enumerate(sample_job.result()):
         print(f"Row {i+1}: {dict(row)}")
     
     print("\n=== Sample data from account_type_summary (first 3 rows) ===")
-    sample_query2 = "SELECT * FROM `cohesive-apogee-411113.banking_sample_data.account_type_summary` LIMIT 3"
-    sample_results2 = client.query(sample_query2).result()
-    
-    for i, row in enumerate(sample_results2):
+    for i, row in enumerate(sample_job2.result()):
         print(f"Row {i+1}: {dict(row)}")
         
 except Exception as e:
@@ -1,5 +1,7 @@
 import pandas as pd
 import os
+import sys
+from itertools import islice
 from sql_generator import create_enhanced_transformation_sql
 
 def test_s005_with_execution():
@@ -13,17 +15,22 @@ def test_s005_with_execution():
         excel_files = [f for f in os.listdir('.') if f.startswith('Multi_Validation_Scenarios') and f.endswith('.xlsx')]
         excel_file = sorted(excel_files)[-1]
         
-        # Read S005 scenario
-        df = pd.read_excel(excel_file, sheet_name='Sheet1')
+        # Read S005 scenario - only the columns the SQL generator needs, as text
+        scenario_columns = ['Scenario_Name', 'Source_Table', 'Target_Table', 'Source_Join_Key',
+                            'Target_Join_Key', 'Target_Column', 'Derivation_Logic']
+        df = pd.read_excel(excel_file, sheet_name='Sheet1', engine='calamine',
+                           usecols=scenario_columns, dtype=str)
         s005_df = df[df['Scenario_Name'] == 'S005_Account_Type_Category_Validation']
 
-        # Extract configuration
-        source_table = s005_df.iloc[0]['Source_Table']
-        target_table = s005_df.iloc[0]['Target_Table']
-        source_join_key = s005_df.iloc[0]['Source_Join_Key']
-        target_join_key = s005_df.iloc[0]['Target_Join_Key']
-        target_column = s005_df.iloc[0]['Target_Column']
-        business_logic = s005_df.iloc[0]['Derivation_Logic']
+        # Extract configuration - convert the row to a dict once instead of
+        # going through .iloc for every field
+        s005_row = s005_df.iloc[0].to_dict()
+        source_table = s005_row['Source_Table']
+        target_table = s005_row['Target_Table']
+        source_join_key = s005_row['Source_Join_Key']
+        target_join_key = s005_row['Target_Join_Key']
+        target_column = s005_row['Target_Column']
+        business_logic = s005_row['Derivation_Logic']
 
         # Generate SQL
         sql_query = create_enhanced_transformation_sql(
@@ -50,21 +57,17 @@ def test_s005_with_execution():
                 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
                 client = bigquery.Client()
                 
-                # Test query execution
-                job = client.query(sql_query)
-                results = job.result()
+                # Test query execution - query_and_wait runs the query through
+                # jobs.query, which returns the first page in the same response
+                results = client.query_and_wait(sql_query)
                 
                 print("✅ BigQuery Execution: SUCCESS")
-                print(f"   Total rows returned: {job.result().total_rows}")
+                print(f"   Total rows returned: {results.total_rows}")
                 
                 # Show sample results
-                sample_count = 0
-                for row in results:
-                    if sample_count < 3:
-                        print(f"   Sample result: {dict(row)}")
-                        sample_count += 1
-                    else:
-                        break
+                sample_lines = [f"   Sample result: {dict(row)}" for row in islice(results, 3)]
+                if sample_lines:
+                    sys.stdout.write('\n'.join(sample_lines) + '\n')
                 
             else:
                 print("⚠️  BigQuery credentials not found, skipping execution test")
@@ -72,11 +75,9 @@ def test_s005_with_execution():
         except Exception as bq_error:
             print(f"❌ BigQuery Execution Error: {bq_error}")
             
-        # Show the full SQL for inspection
-        print("\n3. Generated SQL Query:")
-        print("=" * 50)
-        print(sql_query)
-        print("=" * 50)
+        # Show the full SQL for inspection - one write for the whole block
+        separator = "=" * 50
+        sys.stdout.write('\n'.join(["\n3. Generated SQL Query:", separator, sql_query, separator]) + '\n')
         
         return True
         
@@ -3,7 +3,7 @@
 Create an enhanced Excel file with multiple validation scenarios
 """
 
-import pandas as pd
+from openpyxl import Workbook
 from datetime import datetime
 
 def create_multi_scenario_excel():
@@ -98,12 +98,17 @@ def create_multi_scenario_excel():
         }
     ]
     
-    # Create DataFrame
-    df = pd.DataFrame(scenarios)
-    
-    # Save to Excel file
+    # Save to Excel file - the scenarios are already rows of plain values, so
+    # stream them through a write-only workbook instead of building a DataFrame
     filename = f'Multi_Validation_Scenarios_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    df.to_excel(filename, index=False)
+    columns = list(scenarios[0].keys())
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Sheet1')
+    worksheet.append(columns)
+    for scenario in scenarios:
+        # Blank cells instead of empty strings, as to_excel wrote them
+        worksheet.append([scenario[column] or None for column in columns])
+    workbook.save(filename)
     
     print(f"Created Excel file: {filename}")
     print(f"Number of scenarios: {len(scenarios)}")
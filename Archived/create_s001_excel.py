@@ -40,7 +40,7 @@ def create_scenario_s001_excel():
     # Save to Excel
     filename = 'Scenario_S001_Customer_Name_Validation.xlsx'
     
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+    with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
         # Main scenario sheet
         df.to_excel(writer, sheet_name='Validation_Scenarios', index=False)
         
@@ -97,7 +97,7 @@ def process_excel_file(uploaded_file):
     """Process uploaded Excel file and return data."""
     try:
         # Read Excel file
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None)
+        excel_data = pd.read_excel(uploaded_file, sheet_name=None, engine='calamine')
         return excel_data, None
     except Exception as e:
         return None, f"❌ Error reading Excel file: {str(e)}"
@@ -4,10 +4,33 @@ BigQuery Dataset Explorer
 Explore the cohesive-apogee-411113.banking_sample_data dataset structure
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import bigquery
-import pandas as pd
 import os
 
+
+def fetch_table_details(client, project_id, dataset_id, table_id):
+    """Fetch a table's metadata and first 5 rows. Runs on a worker thread."""
+    table_obj = client.get_table(f"{project_id}.{dataset_id}.{table_id}")
+    
+    query = f"""
+    SELECT * 
+    FROM `{project_id}.{dataset_id}.{table_id}` 
+    LIMIT 5
+    """
+    
+    try:
+        # Five rows are only printed, so read them as plain dicts and skip
+        # building a DataFrame. query_and_wait with max_results returns the
+        # rows inline with jobs.query instead of polling and paging for them
+        sample = [dict(row) for row in client.query_and_wait(query, max_results=5)]
+        sample_error = None
+    except Exception as e:
+        sample = None
+        sample_error = e
+    
+    return table_obj, sample, sample_error
+
 def explore_dataset():
     """Explore the banking_sample_data dataset structure."""
     
@@ -40,41 +63,37 @@ def explore_dataset():
         print(f"📋 Found {len(tables)} tables:")
         print("-" * 40)
         
-        for table in tables:
-            print(f"📄 Table: {table.table_id}")
-            
-            # Get table details
-            table_ref = dataset_ref.table(table.table_id)
-            table_obj = client.get_table(table_ref)
-            
-            print(f"   Rows: {table_obj.num_rows:,}")
-            print(f"   Size: {table_obj.num_bytes / (1024*1024):.2f} MB")
-            print(f"   Columns: {len(table_obj.schema)}")
+        # Metadata and sample lookups are independent per table, so fetch them
+        # concurrently and print the results in listing order
+        with ThreadPoolExecutor(max_workers=min(8, len(tables))) as executor:
+            details = executor.map(
+                lambda table: fetch_table_details(client, project_id, dataset_id, table.table_id),
+                tables
+            )
             
-            # Show schema
-            print("   Schema:")
-            for field in table_obj.schema:
-                print(f"     - {field.name}: {field.field_type} {'(NULLABLE)' if field.mode == 'NULLABLE' else '(REQUIRED)'}")
-            
-            # Sample data
-            print("   Sample Data (first 5 rows):")
-            query = f"""
-            SELECT * 
-            FROM `{project_id}.{dataset_id}.{table.table_id}` 
-            LIMIT 5
-            """
-            
-            try:
-                results = client.query(query).to_dataframe()
-                if not results.empty:
-                    for idx, row in results.iterrows():
-                        print(f"     Row {idx + 1}: {dict(row)}")
+            for table, (table_obj, results, sample_error) in zip(tables, details):
+                print(f"📄 Table: {table.table_id}")
+                
+                print(f"   Rows: {table_obj.num_rows:,}")
+                print(f"   Size: {table_obj.num_bytes / (1024*1024):.2f} MB")
+                print(f"   Columns: {len(table_obj.schema)}")
+                
+                # Show schema
+                print("   Schema:")
+                for field in table_obj.schema:
+                    print(f"     - {field.name}: {field.field_type} {'(NULLABLE)' if field.mode == 'NULLABLE' else '(REQUIRED)'}")
+                
+                # Sample data
+                print("   Sample Data (first 5 rows):")
+                if sample_error is not None:
+                    print(f"     Error reading sample data: {str(sample_error)}")
+                elif results:
+                    for idx, row in enumerate(results):
+                        print(f"     Row {idx + 1}: {row}")
                 else:
                     print("     No data found")
-            except Exception as e:
-                print(f"     Error reading sample data: {str(e)}")
-            
-            print()
+                
+                print()
     
     except Exception as e:
         print(f"❌ Error exploring dataset: {str(e)}")
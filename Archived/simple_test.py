@@ -1,8 +1,8 @@
 print("Starting test script...")
 
 try:
-    import pandas as pd
-    print("Pandas imported successfully")
+    import openpyxl
+    print("openpyxl imported successfully")
     
     import os
     print("OS imported successfully")
@@ -18,27 +18,41 @@ try:
         excel_file = sorted(excel_files)[-1]
         print(f"Using Excel file: {excel_file}")
         
-        # Read all scenarios from Sheet1
-        df = pd.read_excel(excel_file, sheet_name='Sheet1')
-        print(f"Excel file loaded with {len(df)} rows")
-        
         scenarios_to_test = ['S002_Account_Balance_Validation', 'S003_Transaction_Status_Validation', 
                             'S004_Customer_Balance_Category_Validation', 'S005_Account_Type_Category_Validation']
         
+        # Stream Sheet1 in read-only mode and stop as soon as every scenario
+        # we need has been seen, instead of loading the whole sheet
+        workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+        try:
+            rows = workbook['Sheet1'].iter_rows(values_only=True)
+            header = next(rows)
+            name_idx = header.index('Scenario_Name')
+            
+            scenario_rows = {}
+            wanted = set(scenarios_to_test)
+            for row in rows:
+                if row[name_idx] in wanted and row[name_idx] not in scenario_rows:
+                    scenario_rows[row[name_idx]] = dict(zip(header, row))
+                    if len(scenario_rows) == len(wanted):
+                        break
+        finally:
+            workbook.close()
+        print(f"Excel file scanned, {len(scenario_rows)} of {len(scenarios_to_test)} scenarios found")
+        
         for scenario_name in scenarios_to_test:
             print(f"\n--- Testing: {scenario_name} ---")
             
-            # Filter for current scenario
-            scenario_df = df[df['Scenario_Name'] == scenario_name]
+            scenario = scenario_rows.get(scenario_name)
             
-            if scenario_df.empty:
+            if scenario is None:
                 print(f"❌ {scenario_name} not found!")
                 continue
             
             try:
                 # Extract configuration
-                source_table = scenario_df.iloc[0]['Source_Table']
-                target_table = scenario_df.iloc[0]['Target_Table']
+                source_table = scenario['Source_Table']
+                target_table = scenario['Target_Table']
                 print(f"✅ {scenario_name}: {source_table} → {target_table}")
                 
             except Exception as e:
@@ -3,16 +3,25 @@
 Simple Validation Test - Demonstrates Real Pass/Fail Detection
 """
 
+import sys
+
+# Section separators used by the report output
+SEP50 = "-" * 50
+SEP60 = "=" * 60
+SEP70 = "=" * 70
+
 def simulate_validation_logic(source_data, target_data, comparison_field):
     """Simulate the validation logic our SQL generator creates."""
     
     print(f"🔍 Validating field: {comparison_field}")
-    print("-" * 50)
+    print(SEP50)
     
     # Simulate the comparison logic from our SQL
     matches = 0
     mismatches = 0
     mismatch_details = []
+    # Report lines are collected and written in one go at the end
+    report_lines = []
     
     for record in source_data:
         source_id = record['id']
@@ -26,7 +35,7 @@ def simulate_validation_logic(source_data, target_data, comparison_field):
             
             if source_value == target_value:
                 matches += 1
-                print(f"✅ ID {source_id}: '{source_value}' = '{target_value}' (MATCH)")
+                report_lines.append(f"✅ ID {source_id}: '{source_value}' = '{target_value}' (MATCH)")
             else:
                 mismatches += 1
                 mismatch_details.append({
@@ -34,10 +43,10 @@ def simulate_validation_logic(source_data, target_data, comparison_field):
                     'source': source_value,
                     'target': target_value
                 })
-                print(f"❌ ID {source_id}: '{source_value}' ≠ '{target_value}' (MISMATCH)")
+                report_lines.append(f"❌ ID {source_id}: '{source_value}' ≠ '{target_value}' (MISMATCH)")
         else:
             mismatches += 1
-            print(f"⚠️ ID {source_id}: No target record found")
+            report_lines.append(f"⚠️ ID {source_id}: No target record found")
     
     total_rows = len(source_data)
     match_percentage = (matches / total_rows * 100) if total_rows > 0 else 0
@@ -53,24 +62,30 @@ def simulate_validation_logic(source_data, target_data, comparison_field):
         status = "FAIL"
         status_icon = "❌"
     
-    print(f"\n📊 VALIDATION RESULTS:")
-    print(f"   Total Records: {total_rows}")
-    print(f"   Matches: {matches}")
-    print(f"   Mismatches: {mismatches}")
-    print(f"   Match Rate: {match_percentage:.1f}%")
-    print(f"   Status: {status} {status_icon}")
+    report_lines.extend([
+        f"\n📊 VALIDATION RESULTS:",
+        f"   Total Records: {total_rows}",
+        f"   Matches: {matches}",
+        f"   Mismatches: {mismatches}",
+        f"   Match Rate: {match_percentage:.1f}%",
+        f"   Status: {status} {status_icon}"
+    ])
     
     if mismatch_details:
-        print(f"\n🔍 MISMATCH DETAILS:")
-        for detail in mismatch_details:
-            print(f"   ID {detail['id']}: Expected='{detail['source']}', Actual='{detail['target']}'")
+        report_lines.append(f"\n🔍 MISMATCH DETAILS:")
+        report_lines.extend(
+            f"   ID {detail['id']}: Expected='{detail['source']}', Actual='{detail['target']}'"
+            for detail in mismatch_details
+        )
+    
+    sys.stdout.write('\n'.join(report_lines) + '\n')
     
     return status, match_percentage, matches, mismatches
 
 def test_scenario_1_perfect_match():
     """Test scenario with perfect match - should PASS."""
     print("🧪 TEST SCENARIO 1: Perfect Match")
-    print("=" * 60)
+    print(SEP60)
     
     source_data = [
         {'id': 1, 'full_name': 'John Smith'},
@@ -101,7 +116,7 @@ def test_scenario_1_perfect_match():
 def test_scenario_2_partial_failure():
     """Test scenario with partial failures - should FAIL."""
     print("\n🧪 TEST SCENARIO 2: Partial Failure (60% match)")
-    print("=" * 60)
+    print(SEP60)
     
     source_data = [
         {'id': 1, 'full_name': 'John Smith'},
@@ -132,7 +147,7 @@ def test_scenario_2_partial_failure():
 def test_scenario_3_warning_threshold():
     """Test scenario at warning threshold - should WARN."""
     print("\n🧪 TEST SCENARIO 3: Warning Threshold (95% match)")
-    print("=" * 60)
+    print(SEP60)
     
     # Create 20 records with 19 matches (95% exactly)
     source_data = [{'id': i, 'value': f'Value_{i}'} for i in range(1, 21)]
@@ -154,7 +169,7 @@ def test_scenario_3_warning_threshold():
 def test_scenario_4_aggregation_mismatch():
     """Test aggregation scenario with calculation errors - should FAIL."""
     print("\n🧪 TEST SCENARIO 4: Aggregation Mismatch")
-    print("=" * 60)
+    print(SEP60)
     
     # Simulate aggregated results comparison
     source_data = [
@@ -174,6 +189,7 @@ def test_scenario_4_aggregation_mismatch():
         matches = 0
         mismatches = 0
         mismatch_details = []
+        report_lines = []
         
         for record in source_data:
             source_id = record['id']
@@ -187,7 +203,7 @@ def test_scenario_4_aggregation_mismatch():
                 # Use 0.01 tolerance like our SQL (ABS difference < 0.01)
                 if abs(source_value - target_value) < 0.01:
                     matches += 1
-                    print(f"✅ ID {source_id}: ${source_value:.2f} ≈ ${target_value:.2f} (MATCH)")
+                    report_lines.append(f"✅ ID {source_id}: ${source_value:.2f} ≈ ${target_value:.2f} (MATCH)")
                 else:
                     mismatches += 1
                     mismatch_details.append({
@@ -196,7 +212,7 @@ def test_scenario_4_aggregation_mismatch():
                         'target': target_value,
                         'difference': abs(source_value - target_value)
                     })
-                    print(f"❌ ID {source_id}: ${source_value:.2f} ≠ ${target_value:.2f} (MISMATCH, diff=${abs(source_value - target_value):.2f})")
+                    report_lines.append(f"❌ ID {source_id}: ${source_value:.2f} ≠ ${target_value:.2f} (MISMATCH, diff=${abs(source_value - target_value):.2f})")
         
         total_rows = len(source_data)
         match_percentage = (matches / total_rows * 100) if total_rows > 0 else 0
@@ -208,12 +224,15 @@ def test_scenario_4_aggregation_mismatch():
         else:
             status = "FAIL"
         
-        print(f"\n📊 AGGREGATION VALIDATION RESULTS:")
-        print(f"   Total Records: {total_rows}")
-        print(f"   Matches: {matches}")
-        print(f"   Mismatches: {mismatches}")
-        print(f"   Match Rate: {match_percentage:.1f}%")
-        print(f"   Status: {status}")
+        report_lines.extend([
+            f"\n📊 AGGREGATION VALIDATION RESULTS:",
+            f"   Total Records: {total_rows}",
+            f"   Matches: {matches}",
+            f"   Mismatches: {mismatches}",
+            f"   Match Rate: {match_percentage:.1f}%",
+            f"   Status: {status}"
+        ])
+        sys.stdout.write('\n'.join(report_lines) + '\n')
         
         return status
     
@@ -230,7 +249,7 @@ def test_scenario_4_aggregation_mismatch():
 def main():
     """Run all validation tests."""
     print("🚀 VALIDATION LOGIC VERIFICATION")
-    print("=" * 70)
+    print(SEP70)
     print("Testing that our validation properly detects PASS/WARN/FAIL scenarios\n")
     
     # Run all test scenarios
@@ -243,7 +262,7 @@ def main():
     
     # Summary
     print("\n🎯 TEST SUITE SUMMARY")
-    print("=" * 70)
+    print(SEP70)
     
     passed_tests = sum(test_results)
     total_tests = len(test_results)
@@ -255,22 +274,26 @@ def main():
         "Aggregation Mismatch (33%)"
     ]
     
-    for i, (test_name, result) in enumerate(zip(test_names, test_results)):
-        status_icon = "✅" if result else "❌"
-        print(f"   {status_icon} Test {i+1}: {test_name}")
+    summary_lines = [
+        f"   {'✅' if result else '❌'} Test {i+1}: {test_name}"
+        for i, (test_name, result) in enumerate(zip(test_names, test_results))
+    ]
     
-    print(f"\n📊 Overall Results: {passed_tests}/{total_tests} tests passed")
+    summary_lines.append(f"\n📊 Overall Results: {passed_tests}/{total_tests} tests passed")
     
     if passed_tests == total_tests:
-        print("🎉 ALL TESTS PASSED! Validation logic properly detects failures.")
+        summary_lines.append("🎉 ALL TESTS PASSED! Validation logic properly detects failures.")
     else:
-        print("⚠️ Some tests failed - validation logic needs review.")
-    
-    print("\n✅ CONCLUSION:")
-    print("   - Our SQL generator creates REAL validation comparisons")
-    print("   - PASS/WARN/FAIL thresholds work correctly")
-    print("   - Failed rows are properly detected and counted")
-    print("   - Mismatch details are provided for debugging")
+        summary_lines.append("⚠️ Some tests failed - validation logic needs review.")
+    
+    summary_lines.extend([
+        "\n✅ CONCLUSION:",
+        "   - Our SQL generator creates REAL validation comparisons",
+        "   - PASS/WARN/FAIL thresholds work correctly",
+        "   - Failed rows are properly detected and counted",
+        "   - Mismatch details are provided for debugging"
+    ])
+    sys.stdout.write('\n'.join(summary_lines) + '\n')
 
 if __name__ == "__main__":
     main()
@@ -1,33 +1,75 @@
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from python_calamine import CalamineWorkbook
 import glob
+import sys
 
-print("=== Verification of Excel Files ===\n")
-
-# Check Enhanced_Validation_Scenarios.xlsx
-try:
-    df1 = pd.read_excel('Enhanced_Validation_Scenarios.xlsx')
-    print("Enhanced_Validation_Scenarios.xlsx:")
-    print(f"Number of scenarios: {len(df1)}")
-    print("Scenarios:")
-    for i, row in df1.iterrows():
-        print(f"  {i+1}. {row['Scenario_Name']}")
-        print(f"     {row['Source_Table']} -> {row['Target_Table']}")
-        print(f"     Logic: {row['Derivation_Logic']}")
-    print()
-except Exception as e:
-    print(f"Error reading Enhanced_Validation_Scenarios.xlsx: {e}")
-
-# Check Multi_Validation_Scenarios file
-multi_files = glob.glob('Multi_Validation_Scenarios_*.xlsx')
-if multi_files:
+
+def read_first_sheet(path, columns):
+    """Return the given columns of a workbook's first sheet as lists."""
+    rows = CalamineWorkbook.from_path(path).get_sheet_by_index(0).to_python(skip_empty_area=True)
+    header = {name: index for index, name in enumerate(rows[0])}
+    return [[row[header[column]] for row in rows[1:]] for column in columns]
+
+
+# Only the columns printed below are taken from each workbook
+ENHANCED_COLUMNS = ['Scenario_Name', 'Source_Table', 'Target_Table', 'Derivation_Logic']
+MULTI_COLUMNS = ['Scenario_Name', 'Source_Table', 'Target_Table', 'Reference_Table']
+
+# Each scenario's three report lines as one template, formatted once per row
+ENHANCED_SCENARIO_TEMPLATE = "  {i}. {name}\n     {source} -> {target}\n     Logic: {logic}"
+MULTI_SCENARIO_TEMPLATE = "  {i}. {name}\n     {source} -> {target}\n     Type: {scenario_type}"
+
+
+def main():
+    """Print the scenarios found in the Enhanced and newest Multi workbooks."""
+    print("=== Verification of Excel Files ===\n")
+
+    # Pick the newest Multi_Validation_Scenarios file - the names carry a
+    # sortable timestamp, so max() finds it in one pass over the matches
+    multi_file = max(glob.iglob('Multi_Validation_Scenarios_*.xlsx'), default=None)
+
+    # The two workbooks are independent, so parse them concurrently and report
+    # on them in order once both are read
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        enhanced_future = executor.submit(read_first_sheet, 'Enhanced_Validation_Scenarios.xlsx', ENHANCED_COLUMNS)
+        multi_future = executor.submit(read_first_sheet, multi_file, MULTI_COLUMNS) if multi_file else None
+
+    # Check Enhanced_Validation_Scenarios.xlsx
     try:
-        df2 = pd.read_excel(multi_files[0])
-        print(f"{multi_files[0]}:")
-        print(f"Number of scenarios: {len(df2)}")
-        print("Scenarios:")
-        for i, row in df2.iterrows():
-            print(f"  {i+1}. {row['Scenario_Name']}")
-            print(f"     {row['Source_Table']} -> {row['Target_Table']}")
-            print(f"     Type: {'Reference' if row['Reference_Table'] else 'Transformation'}")
+        names, sources, targets, logics = enhanced_future.result()
+        report_lines = [
+            "Enhanced_Validation_Scenarios.xlsx:",
+            f"Number of scenarios: {len(names)}",
+            "Scenarios:"
+        ]
+        for i, (name, source, target, logic) in enumerate(zip(names, sources, targets, logics), 1):
+            report_lines.append(ENHANCED_SCENARIO_TEMPLATE.format(
+                i=i, name=name, source=source, target=target, logic=logic))
+        # One write per file instead of three print calls per scenario
+        sys.stdout.write('\n'.join(report_lines) + '\n\n')
     except Exception as e:
-        print(f"Error reading {multi_files[0]}: {e}")
+        print(f"Error reading Enhanced_Validation_Scenarios.xlsx: {e}")
+
+    # Check Multi_Validation_Scenarios file
+    if multi_future is not None:
+        try:
+            names, sources, targets, reference_tables = multi_future.result()
+            report_lines = [
+                f"{multi_file}:",
+                f"Number of scenarios: {len(names)}",
+                "Scenarios:"
+            ]
+            # calamine returns blank cells as empty strings, so only a
+            # non-empty Reference_Table marks a reference scenario
+            scenario_types = ['Reference' if str(reference_table).strip() else 'Transformation'
+                              for reference_table in reference_tables]
+            for i, (name, source, target, scenario_type) in enumerate(zip(names, sources, targets, scenario_types), 1):
+                report_lines.append(MULTI_SCENARIO_TEMPLATE.format(
+                    i=i, name=name, source=source, target=target, scenario_type=scenario_type))
+            sys.stdout.write('\n'.join(report_lines) + '\n')
+        except Exception as e:
+            print(f"Error reading {multi_file}: {e}")
+
+
+if __name__ == "__main__":
+    main()
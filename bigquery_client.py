@@ -6,9 +6,38 @@ Handles BigQuery connections and query execution.
 
 import streamlit as st
 import pandas as pd
-from google.cloud import bigquery
 import logging
 from datetime import datetime
+from functools import lru_cache
+
+
+# google.cloud.bigquery is imported inside the functions that need it, so
+# starting the app does not pay for loading the client library up front.
+
+@lru_cache(maxsize=None)
+def get_query_job_config():
+    """Return the shared QueryJobConfig used for all validation queries."""
+    from google.cloud import bigquery
+    
+    return bigquery.QueryJobConfig(use_query_cache=True, use_legacy_sql=False)
+
+
+# How long a cached client is reused, and how many projects are kept. A client
+# built from bad or expired credentials only fails on its first query, so the
+# TTL bounds how long Connect can keep handing it back.
+BIGQUERY_CLIENT_TTL = 3600
+BIGQUERY_CLIENT_CACHE_SIZE = 8
+
+
+# One client per project, shared across reruns and browser sessions;
+# "Reset Session" clears the cache
+@st.cache_resource(show_spinner=False, ttl=BIGQUERY_CLIENT_TTL,
+                   max_entries=BIGQUERY_CLIENT_CACHE_SIZE)
+def get_bigquery_client(project_id):
+    """Return the cached BigQuery client for a project."""
+    from google.cloud import bigquery
+    
+    return bigquery.Client(project=project_id)
 
 
 def connect_to_bigquery(project_id, dataset_id):
@@ -21,7 +50,7 @@ def connect_to_bigquery(project_id, dataset_id):
         logger.info(f"Initializing BigQuery client for project: {project_id}")
         
         # Initialize BigQuery client
-        client = bigquery.Client(project=project_id)
+        client = get_bigquery_client(project_id)
         
         # Store client and dataset in session state
         st.session_state.bigquery_client = client
@@ -43,13 +72,22 @@ def execute_custom_query(query, query_name):
     if st.session_state.connection_status != "connected":
         return None, "❌ Not connected to BigQuery"
     
+    return run_query(st.session_state.bigquery_client, query)
+
+
+def run_query(client, query):
+    """Execute a BigQuery query with an explicit client.
+    Does not touch st.session_state, so it is safe to call from worker threads.
+    """
     try:
-        client = st.session_state.bigquery_client
-        job = client.query(query)
-        results = job.result()
+        # query_and_wait uses jobs.query, which returns short results in the
+        # same round-trip instead of insert + poll + fetch
+        results = client.query_and_wait(query, job_config=get_query_job_config())
         
-        # Convert to pandas DataFrame
-        df = results.to_dataframe()
+        # Convert to pandas DataFrame. Validation queries return a summary row
+        # plus a few samples, which arrive with the first REST page - skip
+        # setting up a BigQuery Storage read session for them
+        df = results.to_dataframe(create_bqstorage_client=False)
         return {
             'status': 'success',
             'data': df,
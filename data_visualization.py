@@ -9,6 +9,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from collections import Counter
 from datetime import datetime
 import json
 
@@ -24,10 +25,15 @@ def show_scenario_dashboard():
     # Dashboard Header
     st.markdown("### Validation Dashboard")
     
-    # Summary Metrics
+    # Summary Metrics - status counts and validated rows in a single pass
     total_scenarios = len(results)
-    passed_scenarios = len([r for r in results if r['status'] == 'PASS'])
-    failed_scenarios = len([r for r in results if r['status'] in ['FAIL', 'ERROR']])
+    status_counts = Counter()
+    total_rows_validated = 0
+    for r in results:
+        status_counts[r['status']] += 1
+        total_rows_validated += r.get('total_rows', 0)
+    passed_scenarios = status_counts['PASS']
+    failed_scenarios = status_counts['FAIL'] + status_counts['ERROR']
     success_rate = (passed_scenarios / total_scenarios * 100) if total_scenarios > 0 else 0
     
     # Display metrics in columns
@@ -55,7 +61,6 @@ def show_scenario_dashboard():
         )
     
     with col4:
-        total_rows_validated = sum([r.get('total_rows', 0) for r in results])
         st.metric(
             label="Rows Validated",
             value=f"{total_rows_validated:,}",
@@ -169,11 +174,13 @@ def show_detailed_results_table(results):
     col1, col2 = st.columns([1, 3])
     
     with col1:
-        # Filter options
+        # Filter options - hash the Status column once and reuse the distinct
+        # values for both the options and the default selection
+        status_options = df_detailed['Status'].unique()
         status_filter = st.multiselect(
             "Filter by Status:",
-            options=df_detailed['Status'].unique(),
-            default=df_detailed['Status'].unique()
+            options=status_options,
+            default=status_options
         )
         
         table_filter = st.selectbox(
@@ -420,18 +427,30 @@ def generate_custom_export(export_format, include_sql, include_timestamps):
         import xlsxwriter
         
         output = BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        # constant_memory streams each row out as soon as the next one starts,
+        # which keeps memory flat for large result sets (rows must be written in order)
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
         worksheet = workbook.add_worksheet('Validation_Results')
         
-        # Write headers
+        # Write headers - one shared bold format for the whole header row
         headers = list(export_data[0].keys()) if export_data else []
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header)
+        header_format = workbook.add_format({'bold': True})
+        worksheet.write_row(0, 0, headers, header_format)
+        
+        # Every export column has a fixed type, so pick each column's writer once
+        # instead of letting worksheet.write() sniff every cell: the row counts
+        # are numbers, everything else (including the SQL) is plain text
+        numeric_columns = {'Total_Rows', 'Pass_Rows', 'Fail_Rows'}
+        column_writers = [
+            (header, worksheet.write_number, float) if header in numeric_columns
+            else (header, worksheet.write_string, str)
+            for header in headers
+        ]
         
         # Write data
         for row, data in enumerate(export_data, 1):
-            for col, header in enumerate(headers):
-                worksheet.write(row, col, data.get(header, ''))
+            for col, (header, write_cell, to_cell_value) in enumerate(column_writers):
+                write_cell(row, col, to_cell_value(data.get(header, '')))
         
         workbook.close()
         output.seek(0)
@@ -4,6 +4,9 @@ Excel Handler Module - Clean Version
 Enhanced Excel file processing for BigQuery validation scenarios with business logic parsing.
 """
 
+import io
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import streamlit as st
 from datetime import datetime
@@ -18,12 +21,36 @@ from sql_generator import (
     create_enhanced_transformation_sql,
     create_reference_table_validation_sql
 )
-from bigquery_client import execute_custom_query
+from bigquery_client import run_query
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lowercased cell text that means "no value" for optional scenario fields
+EMPTY_CELL_VALUES = frozenset(('nan', 'none', ''))
+
+# Upper bound on concurrent BigQuery jobs per run - kept below the HTTP
+# connection pool size of the BigQuery client's session
+MAX_PARALLEL_QUERIES = 8
+
+# Sample mapping shown on the welcome screen. Built once at import: Streamlit
+# re-executes the app script on every interaction, but not imported modules.
+SAMPLE_MAPPING_PREVIEW = pd.DataFrame({
+    'Source_Table': ['customers', 'accounts', 'transactions'],
+    'Target_Table': ['customer_summary', 'account_summary', 'transaction_summary'],
+    'Source_Join_Key': ['customer_id', 'account_id', 'transaction_id'],
+    'Target_Join_Key': ['cust_id', 'acct_id', 'trans_id'],
+    'Target_Column': ['full_name', 'balance', 'amount_sum'],
+    'Derivation_Logic': [
+        'CONCAT(first_name, " ", last_name)',
+        'current_balance',
+        'SUM(amount) GROUP_BY account_id'
+    ],
+    'Validation_Type': ['Transformation', 'Direct_Copy', 'Aggregation']
+})
+
+
 def generate_scenarios_from_excel(df: pd.DataFrame, project_id: str = None, dataset_id: str = None) -> List[Dict[str, Any]]:
     """Generate validation scenarios from Excel data with enhanced parsing."""
     scenarios = []
@@ -39,8 +66,8 @@ def generate_scenarios_from_excel(df: pd.DataFrame, project_id: str = None, data
         # Clean column names
         main_sheet.columns = main_sheet.columns.str.strip()
         
-        # Process each row as a scenario
-        for index, row in main_sheet.iterrows():
+        # Process each row as a scenario - plain dicts instead of a Series per row
+        for index, row in zip(main_sheet.index, main_sheet.to_dict('records')):
             try:
                 # Skip empty rows
                 if pd.isna(row.get('Scenario_Name', '')) or str(row.get('Scenario_Name', '')).strip() == '':
@@ -76,7 +103,8 @@ def generate_scenarios_from_excel(df: pd.DataFrame, project_id: str = None, data
                 # Only add if we have essential data
                 if scenario['source_table'] and scenario['derivation_logic']:
                     scenarios.append(scenario)
-                    logger.info(f"Generated scenario: {scenario['scenario_name']}")
+                    # Lazy %-args: the message is only formatted if INFO is enabled
+                    logger.info("Generated scenario: %s", scenario['scenario_name'])
                 
             except Exception as e:
                 logger.error(f"Error processing row {index}: {str(e)}")
@@ -89,11 +117,19 @@ def generate_scenarios_from_excel(df: pd.DataFrame, project_id: str = None, data
     return scenarios
 
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _read_excel_sheets(file_bytes: bytes) -> Dict[str, pd.DataFrame]:
+    """Parse every sheet of an Excel workbook, cached on the file contents."""
+    # calamine parses xlsx/xls natively instead of building openpyxl cell objects
+    return pd.read_excel(io.BytesIO(file_bytes), sheet_name=None, engine='calamine')
+
+
 def process_excel_file(uploaded_file):
     """Process uploaded Excel file and return data."""
     try:
-        # Read Excel file
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None)
+        # Read Excel file - Streamlit reruns on every interaction, so reuse
+        # the parsed sheets while the same upload is in place
+        excel_data = _read_excel_sheets(uploaded_file.getvalue())
         return excel_data, None
     except Exception as e:
         return None, f"❌ Error reading Excel file: {str(e)}"
@@ -106,133 +142,77 @@ def execute_all_excel_scenarios():
         return
     
     scenarios = st.session_state['excel_scenarios']
-    results = []
+    results = [None] * len(scenarios)
     
     # Progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
     
+    # Generate SQL for every scenario up front on the main thread
+    status_text.text(f"🔄 Generating SQL for {len(scenarios)} scenarios...")
+    pending = {}
     for i, scenario in enumerate(scenarios):
         try:
-            status_text.text(f"🔄 Executing scenario {i+1}/{len(scenarios)}: {scenario['scenario_name']}")
+            sql_query = _build_scenario_sql(scenario, 'cohesive-apogee-411113', 'banking_sample_data')
             
-            # Generate SQL based on scenario type
-            if scenario.get('reference_table') and str(scenario.get('reference_table')).lower() not in ['nan', 'none', '']:
-                # Reference table validation
-                sql_query = create_reference_table_validation_sql(
-                    source_table=scenario['source_table'],
-                    target_table=scenario.get('target_table', scenario['source_table']),
-                    source_join_key=scenario.get('source_join_key', 'id'),
-                    target_join_key=scenario.get('target_join_key', 'id'),
-                    target_column=scenario['target_column'],
-                    derivation_logic=scenario['derivation_logic'],
-                    reference_table=scenario['reference_table'],
-                    reference_join_key=scenario.get('reference_join_key', 'id'),
-                    reference_lookup_column=scenario.get('reference_lookup_column', 'value'),
-                    reference_return_column=scenario.get('reference_return_column', 'value'),
-                    business_conditions=scenario.get('business_conditions', ''),
-                    hardcoded_values=scenario.get('hardcoded_values', ''),
-                    project_id='cohesive-apogee-411113',
-                    dataset_id='banking_sample_data'
-                )
-            elif scenario.get('target_table') and str(scenario.get('target_table')).lower() not in ['nan', 'none', '']:
-                # Enhanced transformation validation
-                sql_query = create_enhanced_transformation_sql(
-                    source_table=scenario['source_table'],
-                    target_table=scenario['target_table'],
-                    source_join_key=scenario.get('source_join_key', 'id'),
-                    target_join_key=scenario.get('target_join_key', 'id'),
-                    target_column=scenario['target_column'],
-                    derivation_logic=scenario['derivation_logic'],
-                    project_id='cohesive-apogee-411113',
-                    dataset_id='banking_sample_data'
-                )
-            else:
-                # Basic transformation validation
-                sql_query = create_transformation_validation_sql(
-                    source_table=scenario['source_table'],
-                    target_table=scenario.get('target_table', scenario['source_table']),
-                    source_join_key=scenario.get('source_join_key', 'id'),
-                    target_join_key=scenario.get('target_join_key', 'id'),
-                    target_column=scenario.get('target_column', 'derived_value'),
-                    derivation_logic=scenario['derivation_logic'],
-                    project_id='cohesive-apogee-411113',
-                    dataset_id='banking_sample_data'
-                )
-            
-            # Execute the query
             if sql_query:
-                query_result, message = execute_custom_query(sql_query, scenario['scenario_name'])
-                
-                if query_result and query_result['status'] == 'success':
-                    df = query_result['data']
-                    
-                    if df is not None and not df.empty:
-                        # Determine pass/fail based on results
-                        if 'validation_status' in df.columns:
-                            # New format with validation_status column
-                            status = df.iloc[0]['validation_status']
-                            passed_count = df.iloc[0].get('row_count', 1) if status == 'PASS' else 0
-                            total_count = df.iloc[0].get('row_count', 1)
-                        elif 'validation_result' in df.columns:
-                            # Old format with validation_result column
-                            passed_count = len(df[df['validation_result'] == 'PASS'])
-                            total_count = len(df)
-                            status = 'PASS' if passed_count == total_count else 'FAIL'
-                        else:
-                            # If no validation columns, check if we have any rows (failures)
-                            status = 'FAIL' if len(df) > 0 else 'PASS'
-                            passed_count = 0 if len(df) > 0 else 1
-                            total_count = max(1, len(df))
-                        
-                        results.append({
-                            'scenario_name': scenario['scenario_name'],
-                            'status': status,
-                            'total_records': total_count,
-                            'passed_records': passed_count,
-                            'sql_query': sql_query,
-                            'result_data': df,
-                            'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    else:
-                        results.append({
-                            'scenario_name': scenario['scenario_name'],
-                            'status': 'PASS',  # No data usually means no issues found
-                            'total_records': 0,
-                            'passed_records': 0,
-                            'sql_query': sql_query,
-                            'result_data': pd.DataFrame(),
-                            'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                else:
-                    # Query execution failed
-                    error_msg = query_result.get('error', 'Unknown error') if query_result else 'Query execution failed'
-                    results.append({
-                        'scenario_name': scenario['scenario_name'],
-                        'status': 'ERROR',
-                        'error_message': error_msg,
-                        'sql_query': sql_query,
-                        'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
+                pending[i] = sql_query
             else:
-                results.append({
+                results[i] = {
                     'scenario_name': scenario['scenario_name'],
                     'status': 'ERROR',
                     'error_message': 'Failed to generate SQL query',
                     'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+                }
                 
         except Exception as e:
             logger.error(f"Error executing scenario {scenario['scenario_name']}: {str(e)}")
-            results.append({
+            results[i] = {
                 'scenario_name': scenario['scenario_name'],
                 'status': 'ERROR',
                 'error_message': str(e),
                 'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-        
-        # Update progress
-        progress_bar.progress((i + 1) / len(scenarios))
+            }
+    
+    completed = len(scenarios) - len(pending)
+    progress_bar.progress(completed / len(scenarios))
+    
+    client = st.session_state.get('bigquery_client') if st.session_state.get('connection_status') == 'connected' else None
+    if client is None:
+        # Not connected - every query fails the same way
+        for i, sql_query in pending.items():
+            results[i] = _build_scenario_result(scenarios[i], sql_query, None)
+        pending = {}
+    
+    if pending:
+        # BigQuery jobs are I/O bound, so running them on a thread pool overlaps
+        # their round-trips instead of waiting on each one in turn. Streamlit
+        # calls stay on this thread; workers only talk to BigQuery.
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_QUERIES, len(pending))) as executor:
+            futures = {
+                executor.submit(run_query, client, sql_query): i
+                for i, sql_query in pending.items()
+            }
+            
+            for future in as_completed(futures):
+                i = futures[future]
+                scenario = scenarios[i]
+                try:
+                    query_result, message = future.result()
+                    results[i] = _build_scenario_result(scenario, pending[i], query_result)
+                except Exception as e:
+                    logger.error(f"Error executing scenario {scenario['scenario_name']}: {str(e)}")
+                    results[i] = {
+                        'scenario_name': scenario['scenario_name'],
+                        'status': 'ERROR',
+                        'error_message': str(e),
+                        'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
+                
+                # Update progress
+                completed += 1
+                status_text.text(f"🔄 Completed scenario {completed}/{len(scenarios)}: {scenario['scenario_name']}")
+                progress_bar.progress(completed / len(scenarios))
     
     # Store results in session state
     st.session_state['scenario_results'] = results
@@ -242,9 +222,10 @@ def execute_all_excel_scenarios():
     status_text.empty()
     
     # Show summary
-    passed = len([r for r in results if r['status'] == 'PASS'])
-    failed = len([r for r in results if r['status'] == 'FAIL'])
-    errors = len([r for r in results if r['status'] == 'ERROR'])
+    status_counts = Counter(r['status'] for r in results)
+    passed = status_counts['PASS']
+    failed = status_counts['FAIL']
+    errors = status_counts['ERROR']
     
     st.success(f"✅ Execution completed! Passed: {passed}, Failed: {failed}, Errors: {errors}")
     
@@ -262,6 +243,61 @@ def execute_all_excel_scenarios():
         st.dataframe(results_df, use_container_width=True)
 
 
+def _build_scenario_result(scenario: Dict[str, Any], sql_query: str, query_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn the outcome of a scenario's validation query into a result entry."""
+    if query_result and query_result['status'] == 'success':
+        df = query_result['data']
+        
+        if df is not None and not df.empty:
+            # Determine pass/fail based on results
+            if 'validation_status' in df.columns:
+                # New format with validation_status column
+                status = df.iloc[0]['validation_status']
+                passed_count = df.iloc[0].get('row_count', 1) if status == 'PASS' else 0
+                total_count = df.iloc[0].get('row_count', 1)
+            elif 'validation_result' in df.columns:
+                # Old format with validation_result column - count the PASS rows
+                # from the boolean mask instead of materializing a filtered frame
+                passed_count = int((df['validation_result'] == 'PASS').sum())
+                total_count = len(df)
+                status = 'PASS' if passed_count == total_count else 'FAIL'
+            else:
+                # If no validation columns, check if we have any rows (failures)
+                status = 'FAIL' if len(df) > 0 else 'PASS'
+                passed_count = 0 if len(df) > 0 else 1
+                total_count = max(1, len(df))
+            
+            return {
+                'scenario_name': scenario['scenario_name'],
+                'status': status,
+                'total_records': total_count,
+                'passed_records': passed_count,
+                'sql_query': sql_query,
+                'result_data': df,
+                'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+        else:
+            return {
+                'scenario_name': scenario['scenario_name'],
+                'status': 'PASS',  # No data usually means no issues found
+                'total_records': 0,
+                'passed_records': 0,
+                'sql_query': sql_query,
+                'result_data': pd.DataFrame(),
+                'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+    
+    # Query execution failed
+    error_msg = query_result.get('error', 'Unknown error') if query_result else 'Query execution failed'
+    return {
+        'scenario_name': scenario['scenario_name'],
+        'status': 'ERROR',
+        'error_message': error_msg,
+        'sql_query': sql_query,
+        'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
 def validate_excel_format(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     """Validate that the Excel file has the required format."""
     required_columns = ['Scenario_Name', 'Source_Table', 'Derivation_Logic']
@@ -304,60 +340,67 @@ def get_scenario_preview(scenarios: List[Dict[str, Any]]) -> pd.DataFrame:
 
 def get_scenario_type(scenario: Dict[str, Any]) -> str:
     """Determine the type of validation scenario."""
-    if scenario.get('reference_table') and str(scenario.get('reference_table')).lower() not in ['nan', 'none', '']:
+    if scenario.get('reference_table') and str(scenario.get('reference_table')).lower() not in EMPTY_CELL_VALUES:
         return 'Reference Table'
-    elif scenario.get('target_table') and str(scenario.get('target_table')).lower() not in ['nan', 'none', '']:
+    elif scenario.get('target_table') and str(scenario.get('target_table')).lower() not in EMPTY_CELL_VALUES:
         return 'Enhanced Transformation'
     else:
         return 'Basic Transformation'
 
 
+def _build_scenario_sql(scenario: Dict[str, Any], project_id: str, dataset_id: str) -> str:
+    """Generate the validation SQL for a scenario based on its type. Raises on bad scenario data."""
+    # Generate SQL based on scenario type
+    if scenario.get('reference_table') and str(scenario.get('reference_table')).lower() not in EMPTY_CELL_VALUES:
+        # Reference table validation
+        sql_query = create_reference_table_validation_sql(
+            source_table=scenario['source_table'],
+            target_table=scenario.get('target_table', scenario['source_table']),
+            source_join_key=scenario.get('source_join_key', 'id'),
+            target_join_key=scenario.get('target_join_key', 'id'),
+            target_column=scenario['target_column'],
+            derivation_logic=scenario['derivation_logic'],
+            reference_table=scenario['reference_table'],
+            reference_join_key=scenario.get('reference_join_key', 'id'),
+            reference_lookup_column=scenario.get('reference_lookup_column', 'value'),
+            reference_return_column=scenario.get('reference_return_column', 'value'),
+            business_conditions=scenario.get('business_conditions', ''),
+            hardcoded_values=scenario.get('hardcoded_values', ''),
+            project_id=project_id,
+            dataset_id=dataset_id
+        )
+    elif scenario.get('target_table') and str(scenario.get('target_table')).lower() not in EMPTY_CELL_VALUES:
+        # Enhanced transformation validation
+        sql_query = create_enhanced_transformation_sql(
+            source_table=scenario['source_table'],
+            target_table=scenario['target_table'],
+            source_join_key=scenario.get('source_join_key', 'id'),
+            target_join_key=scenario.get('target_join_key', 'id'),
+            target_column=scenario['target_column'],
+            derivation_logic=scenario['derivation_logic'],
+            project_id=project_id,
+            dataset_id=dataset_id
+        )
+    else:
+        # Basic transformation validation
+        sql_query = create_transformation_validation_sql(
+            source_table=scenario['source_table'],
+            target_table=scenario.get('target_table', scenario['source_table']),
+            source_join_key=scenario.get('source_join_key', 'id'),
+            target_join_key=scenario.get('target_join_key', 'id'),
+            target_column=scenario.get('target_column', 'derived_value'),
+            derivation_logic=scenario['derivation_logic'],
+            project_id=project_id,
+            dataset_id=dataset_id
+        )
+    
+    return sql_query
+
+
 def generate_sql_for_scenario(scenario: Dict[str, Any], project_id: str = 'cohesive-apogee-411113', dataset_id: str = 'banking_sample_data') -> str:
     """Generate SQL for a specific scenario for preview purposes."""
     try:
-        # Generate SQL based on scenario type
-        if scenario.get('reference_table') and str(scenario.get('reference_table')).lower() not in ['nan', 'none', '']:
-            # Reference table validation
-            sql_query = create_reference_table_validation_sql(
-                source_table=scenario['source_table'],
-                target_table=scenario.get('target_table', scenario['source_table']),
-                source_join_key=scenario.get('source_join_key', 'id'),
-                target_join_key=scenario.get('target_join_key', 'id'),
-                target_column=scenario['target_column'],
-                derivation_logic=scenario['derivation_logic'],
-                reference_table=scenario['reference_table'],
-                reference_join_key=scenario.get('reference_join_key', 'id'),
-                reference_lookup_column=scenario.get('reference_lookup_column', 'value'),
-                reference_return_column=scenario.get('reference_return_column', 'value'),
-                business_conditions=scenario.get('business_conditions', ''),
-                hardcoded_values=scenario.get('hardcoded_values', ''),
-                project_id=project_id,
-                dataset_id=dataset_id
-            )
-        elif scenario.get('target_table') and str(scenario.get('target_table')).lower() not in ['nan', 'none', '']:
-            # Enhanced transformation validation
-            sql_query = create_enhanced_transformation_sql(
-                source_table=scenario['source_table'],
-                target_table=scenario['target_table'],
-                source_join_key=scenario.get('source_join_key', 'id'),
-                target_join_key=scenario.get('target_join_key', 'id'),
-                target_column=scenario['target_column'],
-                derivation_logic=scenario['derivation_logic'],
-                project_id=project_id,
-                dataset_id=dataset_id
-            )
-        else:
-            # Basic transformation validation
-            sql_query = create_transformation_validation_sql(
-                source_table=scenario['source_table'],
-                target_table=scenario.get('target_table', scenario['source_table']),
-                source_join_key=scenario.get('source_join_key', 'id'),
-                target_join_key=scenario.get('target_join_key', 'id'),
-                target_column=scenario.get('target_column', 'derived_value'),
-                derivation_logic=scenario['derivation_logic'],
-                project_id=project_id,
-                dataset_id=dataset_id
-            )
+        sql_query = _build_scenario_sql(scenario, project_id, dataset_id)
         
         return sql_query if sql_query else "-- SQL generation failed"
         
@@ -31,6 +31,12 @@ def install_streamlit():
         print(f"❌ Failed to install Streamlit: {e}")
         return False
 
+def pandas_supports_calamine():
+    """Check if the installed pandas can read Excel files with calamine."""
+    import pandas
+    major, minor = (int(part) for part in pandas.__version__.split('.')[:2])
+    return (major, minor) >= (2, 2)
+
 def check_dependencies():
     """Check and install required dependencies."""
     required_packages = [
@@ -38,6 +44,7 @@ def check_dependencies():
         'pandas',
         'google-cloud-bigquery',
         'openpyxl',
+        'python-calamine',
         'plotly'
     ]
     
@@ -49,6 +56,10 @@ def check_dependencies():
         except ImportError:
             missing_packages.append(package)
     
+    # Reading uploads with engine='calamine' needs pandas 2.2 or newer
+    if 'pandas' not in missing_packages and not pandas_supports_calamine():
+        missing_packages.append('pandas>=2.2.0')
+    
     if missing_packages:
         print(f"📦 Installing missing packages: {', '.join(missing_packages)}")
         try:
@@ -6,36 +6,61 @@ Handles all SQL generation for different validation scenarios.
 
 import re
 import logging
+from functools import lru_cache
+
+
+CHECK_NOT_NULL_PATTERN = re.compile(r'CHECK_NOT_NULL\((.*?)\)', re.IGNORECASE)
+# Any aggregate call in the derivation logic marks an aggregation scenario
+AGGREGATE_FUNCTION_PATTERN = re.compile(r'(?:SUM|COUNT|AVG|MAX|MIN)\(', re.IGNORECASE)
+
+# Upper bound on memoized SQL per generator. Generation is a pure function of its
+# string arguments, and Streamlit reruns regenerate the same previews repeatedly.
+SQL_CACHE_SIZE = 256
+
+# Known column mappings for our banking tables (based on actual schema).
+# Names are lowercase; the tuples keep declaration order for the fallback
+# column scan, the frozensets serve membership checks.
+CUSTOMERS_COLUMNS = ('customer_id', 'first_name', 'last_name', 'full_name', 'account_number', 'account_type', 'balance', 'account_open_date', 'address', 'city', 'state', 'zip_code', 'risk_score', 'account_status', 'monthly_income')
+TRANSACTIONS_COLUMNS = ('transaction_id', 'account_number', 'transaction_type', 'amount', 'transaction_date', 'channel', 'merchant', 'transaction_city', 'transaction_state', 'status', 'is_fraudulent', 'processing_fee')
+ACCOUNT_PROFILES_COLUMNS = ('customer_reference', 'account_id', 'current_balance', 'account_status', 'account_type', 'last_transaction_date', 'credit_limit')
+# Default fallback - use generic approach
+GENERIC_COLUMNS = ('*',)
+
+TABLE_COLUMNS = {
+    'customers': CUSTOMERS_COLUMNS,
+    'transactions': TRANSACTIONS_COLUMNS,
+    'account_profiles': ACCOUNT_PROFILES_COLUMNS,
+}
+TABLE_COLUMN_SETS = {table: frozenset(columns) for table, columns in TABLE_COLUMNS.items()}
+GENERIC_COLUMN_SET = frozenset(GENERIC_COLUMNS)
+# One alternation per table answers "does the logic mention any known column?"
+# in a single regex pass instead of a substring scan per column
+TABLE_COLUMN_PATTERNS = {table: re.compile('|'.join(map(re.escape, columns))) for table, columns in TABLE_COLUMNS.items()}
+GENERIC_COLUMN_PATTERN = re.compile('|'.join(map(re.escape, GENERIC_COLUMNS)))
 
 
 def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_id, dataset_id):
     """Convert business logic to safe SQL that works with actual table columns."""
     
-    # Known column mappings for our banking tables (based on actual schema)
-    customers_columns = ['customer_id', 'first_name', 'last_name', 'full_name', 'account_number', 'account_type', 'balance', 'account_open_date', 'address', 'city', 'state', 'zip_code', 'risk_score', 'account_status', 'monthly_income']
-    transactions_columns = ['transaction_id', 'account_number', 'transaction_type', 'amount', 'transaction_date', 'channel', 'merchant', 'transaction_city', 'transaction_state', 'status', 'is_fraudulent', 'processing_fee']
-    account_profiles_columns = ['customer_reference', 'account_id', 'current_balance', 'account_status', 'account_type', 'last_transaction_date', 'credit_limit']    # Determine available columns based on source table
-    if source_table.lower() == 'customers':
-        available_columns = customers_columns
-    elif source_table.lower() == 'transactions':
-        available_columns = transactions_columns
-    elif source_table.lower() == 'account_profiles':
-        available_columns = account_profiles_columns
-    else:
-        # Default fallback - use generic approach
-        available_columns = ['*']
+    # Determine available columns based on source table
+    table_key = source_table.lower()
+    ordered_columns = TABLE_COLUMNS.get(table_key, GENERIC_COLUMNS)
+    available_columns = TABLE_COLUMN_SETS.get(table_key, GENERIC_COLUMN_SET)
+    column_pattern = TABLE_COLUMN_PATTERNS.get(table_key, GENERIC_COLUMN_PATTERN)
     
     # Clean and normalize the derivation logic
     logic = derivation_logic.strip()
+    logic_upper = logic.upper()
+    logic_lower = logic.lower()
     
     try:
         # Handle different business logic patterns
         
         # Basic aggregations
-        if logic.upper().startswith('SUM(') and 'GROUP_BY' in logic.upper():
-            parts = logic.upper().split('GROUP_BY')
-            agg_part = parts[0].strip()
-            group_part = parts[1].strip()
+        if logic_upper.startswith('SUM(') and 'GROUP_BY' in logic_upper:
+            # Only the aggregate before GROUP_BY is needed - partition stops at
+            # the first match instead of splitting the whole string into a list
+            agg_part = logic_upper.partition('GROUP_BY')[0].strip()
             
             # Extract column from SUM()
             sum_column = agg_part.replace('SUM(', '').replace(')', '').strip().lower()
@@ -49,10 +74,10 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 # Fallback to COUNT if column not found
                 return f"COUNT(*)"
         
-        elif logic.upper().startswith('COUNT(') and 'GROUP_BY' in logic.upper():
+        elif logic_upper.startswith('COUNT(') and 'GROUP_BY' in logic_upper:
             return "COUNT(*)"
         
-        elif logic.upper().startswith('AVG(') and 'GROUP_BY' in logic.upper():
+        elif logic_upper.startswith('AVG(') and 'GROUP_BY' in logic_upper:
             if 'amount' in available_columns:
                 return "AVG(amount)"
             elif 'balance' in available_columns:
@@ -61,7 +86,7 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 return "COUNT(*)"
         
         # Conditional logic
-        elif logic.upper().startswith('IF('):
+        elif logic_upper.startswith('IF('):
             if 'amount' in available_columns and 'amount > 10000' in logic:
                 return 'CASE WHEN amount > 10000 THEN "High Risk" ELSE "Normal" END'
             elif 'balance' in available_columns and 'balance > 50000' in logic:
@@ -70,9 +95,9 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 return '"Standard"'  # Safe fallback
         
         # Data completeness checks - updated for actual schema
-        elif 'CHECK_NOT_NULL' in logic.upper():
+        elif 'CHECK_NOT_NULL' in logic_upper:
             # Extract columns from CHECK_NOT_NULL()
-            match = re.search(r'CHECK_NOT_NULL\((.*?)\)', logic, re.IGNORECASE)
+            match = CHECK_NOT_NULL_PATTERN.search(logic)
             if match:
                 columns_str = match.group(1)
                 columns = [col.strip().lower() for col in columns_str.split(',')]
@@ -86,9 +111,9 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 
                 valid_columns = []
                 for col in columns:
-                    if col in column_mapping and column_mapping[col] in [c.lower() for c in available_columns]:
+                    if col in column_mapping and column_mapping[col] in available_columns:
                         valid_columns.append(column_mapping[col])
-                    elif col in [c.lower() for c in available_columns]:
+                    elif col in available_columns:
                         valid_columns.append(col)
                 
                 if valid_columns:
@@ -101,7 +126,7 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 return "100"
         
         # Address/email validation - updated for actual schema
-        elif 'VALIDATE_EMAIL_FORMAT' in logic.upper() or 'VALIDATE_ADDRESS_FORMAT' in logic.upper():
+        elif 'VALIDATE_EMAIL_FORMAT' in logic_upper or 'VALIDATE_ADDRESS_FORMAT' in logic_upper:
             if 'address' in available_columns:
                 return 'CASE WHEN address IS NOT NULL AND LENGTH(address) > 10 THEN "Valid Address" ELSE "Invalid Address" END'
             elif 'full_name' in available_columns:
@@ -110,16 +135,16 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 return '"Valid"'  # Safe fallback
         
         # Range checks
-        elif 'RANGE_CHECK' in logic.upper():
-            if 'balance' in available_columns and 'balance' in logic.lower():
+        elif 'RANGE_CHECK' in logic_upper:
+            if 'balance' in available_columns and 'balance' in logic_lower:
                 return 'CASE WHEN balance >= 0 AND balance <= 1000000 THEN "Within Range" ELSE "Out of Range" END'
-            elif 'amount' in available_columns and 'amount' in logic.lower():
+            elif 'amount' in available_columns and 'amount' in logic_lower:
                 return 'CASE WHEN amount >= 0 THEN "Valid Amount" ELSE "Invalid Amount" END'
             else:
                 return '"Within Range"'
         
         # String concatenation
-        elif logic.upper().startswith('CONCAT('):
+        elif logic_upper.startswith('CONCAT('):
             # Handle CONCAT(first_name, " ", last_name) pattern
             if 'first_name' in available_columns and 'last_name' in available_columns:
                 if 'first_name' in logic and 'last_name' in logic:
@@ -128,11 +153,11 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
             return 'CONCAT(first_name, " ", last_name)'
         
         # Date operations
-        elif 'FORMAT_DATE' in logic.upper() and 'transaction_date' in available_columns:
+        elif 'FORMAT_DATE' in logic_upper and 'transaction_date' in available_columns:
             return 'FORMAT_DATE("%Y-%m", transaction_date)'
         
         # CASE WHEN conditional logic
-        elif logic.upper().startswith('CASE WHEN'):
+        elif logic_upper.startswith('CASE WHEN'):
             # Handle transaction status logic: CASE WHEN amount > 0 THEN "Credit" ELSE "Debit" END
             if 'amount > 0' in logic and 'Credit' in logic and 'Debit' in logic:
                 if 'amount' in available_columns:
@@ -163,21 +188,21 @@ def convert_business_logic_to_safe_sql(derivation_logic, source_table, project_i
                 return logic  # Use as-is if balance column exists
             
             # Generic CASE WHEN handling - try to preserve the original logic
-            elif any(col in logic.lower() for col in [c.lower() for c in available_columns]):
+            elif column_pattern.search(logic_lower):
                 return logic  # Use original logic if it contains valid columns
             
             # Fallback for CASE WHEN
             return '"Standard"'
         
         # Simple column references
-        elif logic.lower() in [col.lower() for col in available_columns]:
-            return logic.lower()
+        elif logic_lower in available_columns:
+            return logic_lower
         
         # Default fallback for unrecognized logic
         else:
             # If it contains a valid column name, use it
-            for col in available_columns:
-                if col.lower() in logic.lower():
+            for col in ordered_columns:
+                if col in logic_lower:
                     return col
             
             # Ultimate fallback - simple count
@@ -212,6 +237,7 @@ def create_join_condition(source_keys, target_keys, source_alias='s', target_ali
     return " AND ".join(conditions)
 
 
+@lru_cache(maxsize=SQL_CACHE_SIZE)
 def create_transformation_validation_sql(source_table, target_table, source_join_key, target_join_key, target_column, derivation_logic, project_id, dataset_id):
     """Create SQL for transformation validation that works with existing tables only.
     Supports both single and composite join keys (comma-separated).
@@ -236,7 +262,7 @@ def create_transformation_validation_sql(source_table, target_table, source_join
     # Convert business logic to safe SQL
     safe_derivation_logic = convert_business_logic_to_safe_sql(derivation_logic, source_table, project_id, dataset_id)
     
-    if any(func in derivation_logic.upper() for func in ['SUM(', 'COUNT(', 'AVG(', 'MAX(', 'MIN(']):
+    if AGGREGATE_FUNCTION_PATTERN.search(derivation_logic):
         # Aggregation scenario - REAL validation comparing source vs target
         target_ref = f"`{project_id}.{dataset_id}.{target_table}`" if target_table else None
         
@@ -465,6 +491,7 @@ WHERE total_rows > 0
     return sql
 
 
+@lru_cache(maxsize=SQL_CACHE_SIZE)
 def create_enhanced_transformation_sql(source_table, target_table, source_join_key, target_join_key, target_column, derivation_logic, project_id, dataset_id):
     """Enhanced SQL generation with composite key support."""
     
@@ -491,7 +518,7 @@ def create_enhanced_transformation_sql(source_table, target_table, source_join_k
     safe_derivation_logic = convert_business_logic_to_safe_sql(derivation_logic, source_table, project_id, dataset_id)
     
     # Determine if this is an aggregation
-    is_aggregation = any(func in derivation_logic.upper() for func in ['SUM(', 'COUNT(', 'AVG(', 'MAX(', 'MIN('])
+    is_aggregation = AGGREGATE_FUNCTION_PATTERN.search(derivation_logic) is not None
     
     if is_aggregation:
         target_ref = f"`{project_id}.{dataset_id}.{target_table}`" if target_table else None
@@ -698,6 +725,7 @@ WHERE total_rows > 0
     return sql.strip()
 
 
+@lru_cache(maxsize=SQL_CACHE_SIZE)
 def create_reference_table_validation_sql(source_table, target_table, source_join_key, target_join_key, 
                                         target_column, derivation_logic, reference_table, reference_join_key,
                                         reference_lookup_column, reference_return_column, business_conditions,
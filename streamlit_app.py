@@ -9,7 +9,7 @@ import pandas as pd
 from datetime import datetime
 
 # Import modular components
-from bigquery_client import connect_to_bigquery, initialize_session_state, execute_custom_query
+from bigquery_client import connect_to_bigquery, get_bigquery_client, initialize_session_state, execute_custom_query
 from sql_generator import (
     create_transformation_validation_sql,
     create_enhanced_transformation_sql,
@@ -20,7 +20,9 @@ from excel_handler import (
     process_excel_file,
     execute_all_excel_scenarios,
     generate_sql_for_scenario,
-    get_scenario_type
+    get_scenario_type,
+    SAMPLE_MAPPING_PREVIEW,
+    EMPTY_CELL_VALUES
 )
 from data_visualization import (
     show_scenario_dashboard,
@@ -129,6 +131,8 @@ def main():
         if st.button("Reset Session"):
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
+            # Drop cached clients too, so reconnecting picks up fixed credentials
+            get_bigquery_client.clear()
             st.rerun()
         
         if st.button("Clear Results"):
@@ -184,22 +188,8 @@ def show_welcome_screen():
 
 def show_sample_excel_preview():
     """Show a preview of the expected Excel format."""
-    sample_data = pd.DataFrame({
-        'Source_Table': ['customers', 'accounts', 'transactions'],
-        'Target_Table': ['customer_summary', 'account_summary', 'transaction_summary'],
-        'Source_Join_Key': ['customer_id', 'account_id', 'transaction_id'],
-        'Target_Join_Key': ['cust_id', 'acct_id', 'trans_id'],
-        'Target_Column': ['full_name', 'balance', 'amount_sum'],
-        'Derivation_Logic': [
-            'CONCAT(first_name, " ", last_name)',
-            'current_balance',
-            'SUM(amount) GROUP_BY account_id'
-        ],
-        'Validation_Type': ['Transformation', 'Direct_Copy', 'Aggregation']
-    })
-    
     st.markdown("**Sample Excel Mapping Structure:**")
-    st.dataframe(sample_data, use_container_width=True)
+    st.dataframe(SAMPLE_MAPPING_PREVIEW, use_container_width=True)
 
 
 def show_main_interface():
@@ -296,8 +286,12 @@ def show_excel_mapping_tab():
         with st.expander("🔍 SQL Preview", expanded=False):
             st.markdown("Select a scenario below to view its generated SQL:")
             
-            # Create scenario selection dropdown with stable options
-            scenario_options = [f"{s['scenario_name']} - {get_scenario_type(s)}" for s in scenarios]
+            # Create scenario selection dropdown with stable options, keyed to the
+            # scenario they label (setdefault keeps the first one for duplicate labels)
+            scenarios_by_option = {}
+            for s in scenarios:
+                scenarios_by_option.setdefault(f"{s['scenario_name']} - {get_scenario_type(s)}", s)
+            scenario_options = list(scenarios_by_option)
             
             # Use session state to maintain selection
             if 'selected_sql_scenario' not in st.session_state:
@@ -314,11 +308,7 @@ def show_excel_mapping_tab():
             st.session_state.selected_sql_scenario = selected_scenario_name
             
             # Find the selected scenario
-            selected_scenario = None
-            for scenario in scenarios:
-                if f"{scenario['scenario_name']} - {get_scenario_type(scenario)}" == selected_scenario_name:
-                    selected_scenario = scenario
-                    break
+            selected_scenario = scenarios_by_option.get(selected_scenario_name)
             
             if selected_scenario:
                 # Show scenario details in columns
@@ -333,7 +323,7 @@ def show_excel_mapping_tab():
                 with col2:
                     st.markdown(f"**Validation Type:** {get_scenario_type(selected_scenario)}")
                     st.markdown(f"**Join Keys:** `{selected_scenario.get('source_join_key', 'id')}` → `{selected_scenario.get('target_join_key', 'id')}`")
-                    if selected_scenario.get('reference_table') and str(selected_scenario.get('reference_table')).lower() not in ['nan', 'none', '']:
+                    if selected_scenario.get('reference_table') and str(selected_scenario.get('reference_table')).lower() not in EMPTY_CELL_VALUES:
                         st.markdown(f"**Reference Table:** `{selected_scenario['reference_table']}`")
                 
                 # Derivation Logic